@@ -272,48 +272,52 @@ class BaseInstaseisDB(with_metaclass(ABCMeta)):
             kernelwidth=kernelwidth, remove_source_shift=remove_source_shift,
             reconvolve_stf=reconvolve_stf)
 
+        if reconvolve_stf:
+            # We assume here that the sliprate is well-behaved,
+            # e.g. zeros at the boundaries and no energy above the mesh
+            # resolution.
+            if source.dt is None or source.sliprate is None:
+                raise ValueError("source has no source time function")
+
+            if STF_MAP[self.info.stf] not in [0, 1]:
+                raise NotImplementedError(
+                    'deconvolution not implemented for stf %s'
+                    % (self.info.stf))
+
+            stf_deconv_f = np.fft.rfft(
+                stf_deconv_map[STF_MAP[self.info.stf]],
+                n=self.info.nfft)
+
+            if abs((source.dt - self.info.dt) / self.info.dt) > 1e-7:
+                raise ValueError("dt of the source not compatible")
+
+            stf_conv_f = np.fft.rfft(source.sliprate,
+                                     n=self.info.nfft)
+
+            if source.time_shift is not None:
+                stf_conv_f *= \
+                    np.exp(- 1j * rfftfreq(self.info.nfft) *
+                           2. * np.pi * source.time_shift / self.info.dt)
+
+            # The transfer function is the same for all components.
+            # Ensure numerical stability by not dividing with zero.
+            f = stf_conv_f
+            _l = np.abs(stf_deconv_f)
+            _idx = np.where(_l > 0.0)
+            f[_idx] /= stf_deconv_f[_idx]
+            f[_l == 0] = 0 + 0j
+
+            # Apply a 5 percent, at least 5 samples taper at the end.
+            # The first sample is guaranteed to be zero in any case. All
+            # components have the same length so it is only built once.
+            tlen = max(int(math.ceil(0.05 * self.info.npts)), 5)
+            taper = np.ones(self.info.npts)
+            taper[-tlen:] = scipy.signal.hann(tlen * 2)[tlen:]
+
         for comp in components:
             if reconvolve_stf:
-                # We assume here that the sliprate is well-behaved,
-                # e.g. zeros at the boundaries and no energy above the mesh
-                # resolution.
-                if source.dt is None or source.sliprate is None:
-                    raise ValueError("source has no source time function")
-
-                if STF_MAP[self.info.stf] not in [0, 1]:
-                    raise NotImplementedError(
-                        'deconvolution not implemented for stf %s'
-                        % (self.info.stf))
-
-                stf_deconv_f = np.fft.rfft(
-                    stf_deconv_map[STF_MAP[self.info.stf]],
-                    n=self.info.nfft)
-
-                if abs((source.dt - self.info.dt) / self.info.dt) > 1e-7:
-                    raise ValueError("dt of the source not compatible")
-
-                stf_conv_f = np.fft.rfft(source.sliprate,
-                                         n=self.info.nfft)
-
-                if source.time_shift is not None:
-                    stf_conv_f *= \
-                        np.exp(- 1j * rfftfreq(self.info.nfft) *
-                               2. * np.pi * source.time_shift / self.info.dt)
-
-                # Apply a 5 percent, at least 5 samples taper at the end.
-                # The first sample is guaranteed to be zero in any case.
-                tlen = max(int(math.ceil(0.05 * len(data[comp]))), 5)
-                taper = np.ones_like(data[comp])
-                taper[-tlen:] = scipy.signal.hann(tlen * 2)[tlen:]
                 dataf = np.fft.rfft(taper * data[comp], n=self.info.nfft)
 
-                # Ensure numerical stability by not dividing with zero.
-                f = stf_conv_f
-                _l = np.abs(stf_deconv_f)
-                _idx = np.where(_l > 0.0)
-                f[_idx] /= stf_deconv_f[_idx]
-                f[_l == 0] = 0 + 0j
-
                 data[comp] = np.fft.irfft(dataf * f)[:self.info.npts]
 
             if dt is not None:
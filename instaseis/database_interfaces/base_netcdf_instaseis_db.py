@@ -18,6 +18,7 @@ from future.utils import with_metaclass
 
 from abc import ABCMeta, abstractmethod
 import collections
+import math
 
 import numpy as np
 from obspy.signal.util import next_pow_2
@@ -65,6 +66,9 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
         self.db_path = db_path
         self.buffer_size_in_mb = buffer_size_in_mb
         self.read_on_demand = read_on_demand
+        # Single entry cache for the receiver dependent part of the tensor
+        # rotation.
+        self._receiver_rotation = (None, None)
 
     def _get_element_info(self, coordinates):
         """
@@ -161,6 +165,183 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
         """
         raise NotImplementedError
 
+    def _get_receiver_rotation(self, receiver):
+        """
+        Rotation matrix from the earth to the receiver system, see
+        :func:`~instaseis.rotations.compose_voigt_rotation`.
+
+        It only depends on the receiver and is kept for subsequent calls,
+        e.g. all point sources of a finite source or all source mechanisms
+        needed for a Green's function.
+        """
+        key = (receiver.longitude, receiver.colatitude)
+        # Unpack once as another thread might replace the cached tuple.
+        cached_key, rotmat_receiver = self._receiver_rotation
+        if cached_key != key:
+            rotmat_receiver = rotations.get_rotmat_xyz_earth_to_xyz_src(
+                math.radians(receiver.longitude),
+                math.radians(receiver.colatitude))
+            self._receiver_rotation = (key, rotmat_receiver)
+        return rotmat_receiver
+
+    @staticmethod
+    def _get_strain_weights(mij, phi, components):
+        """
+        Weights of the six Voigt strain components for each requested
+        component of a moment tensor source in a reciprocal database.
+
+        Each seismogram component is then just the dot product of the
+        interpolated strain with its weight vector. The ``"Z"`` component
+        has to be applied to the strain of the vertical database, all
+        others to the one of the horizontal database.
+
+        :param mij: The moment tensor in Voigt notation, already rotated to
+            the s, phi, z system of the receiver.
+        :param phi: The azimuth of the source in that system.
+        :param components: The requested components.
+        """
+        weights = {}
+
+        if "Z" in components:
+            weights["Z"] = mij * np.array([1.0, 1.0, 1.0, 0.0, 2.0, 0.0])
+
+        if "R" in components:
+            weights["R"] = mij * np.array([-1.0, -1.0, -1.0, 0.0, -2.0, 0.0])
+
+        if "T" in components:
+            weights["T"] = mij * np.array([0.0, 0.0, 0.0, 2.0, 0.0, 2.0])
+
+        if "E" in components or "N" in components:
+            cos_phi = math.cos(phi)
+            sin_phi = math.sin(phi)
+
+            # The N component points in the opposite direction of theta.
+            for comp, fac_1, fac_2 in (("E", sin_phi, cos_phi),
+                                       ("N", -cos_phi, sin_phi)):
+                if comp not in components:
+                    continue
+                weights[comp] = mij * np.array([
+                    fac_1, fac_1, fac_1, 2.0 * fac_2, 2.0 * fac_1,
+                    2.0 * fac_2])
+
+        return weights
+
+    @staticmethod
+    def _get_displacement_weights(force, phi, components):
+        """
+        Weights of the three displacement components for each requested
+        component of a force source in a reciprocal database.
+
+        Same as :meth:`_get_strain_weights` but for the interpolated
+        displacement.
+
+        :param force: The force vector, already rotated to the s, phi, z
+            system of the receiver.
+        :param phi: The azimuth of the source in that system.
+        :param components: The requested components.
+        """
+        weights = {}
+
+        if "Z" in components:
+            weights["Z"] = force * np.array([1.0, 0.0, 1.0])
+
+        if "R" in components:
+            weights["R"] = force * np.array([1.0, 0.0, 1.0])
+
+        if "T" in components:
+            weights["T"] = force * np.array([0.0, 1.0, 0.0])
+
+        if "E" in components or "N" in components:
+            cos_phi = math.cos(phi)
+            sin_phi = math.sin(phi)
+
+            # The N component points in the opposite direction of theta.
+            for comp, fac_1, fac_2 in (("E", sin_phi, cos_phi),
+                                       ("N", -cos_phi, sin_phi)):
+                if comp not in components:
+                    continue
+                weights[comp] = force * np.array([fac_1, fac_2, fac_1])
+
+        return weights
+
+    @staticmethod
+    def _apply_weights(weights, data_x, data_z, data):
+        """
+        Apply the weights of :meth:`_get_strain_weights` or
+        :meth:`_get_displacement_weights` to the interpolated horizontal
+        and vertical fields and store the resulting components in ``data``.
+
+        All horizontal components are computed with a single matrix
+        product into one ``(ncomp, npts)`` array so each component is a
+        contiguous row.
+        """
+        horizontal = [comp for comp in weights if comp != "Z"]
+        if horizontal:
+            final = np.dot(np.array([weights[comp] for comp in horizontal]),
+                           data_x.T)
+            for _i, comp in enumerate(horizontal):
+                data[comp] = final[_i]
+
+        if "Z" in weights:
+            data["Z"] = np.dot(data_z, weights["Z"])
+
+    @staticmethod
+    def _get_forward_weights(mij, source, receiver, components, coordinates):
+        """
+        Weights of the s, phi, z displacement of the four fundamental
+        sources of a forward database (MZZ, MXX+MYY, MXZ/MYZ and
+        MXY/MXX-MYY) for each requested component.
+
+        The rotation to the final components is folded into the weights so
+        that the displacement time series only have to be traversed once.
+        Returns an array of shape ``(10, len(components))`` in the order of
+        ``components``. The rows correspond to the s and z displacement of
+        MZZ and MXX+MYY, followed by the s, phi and z displacement of
+        MXZ/MYZ and MXY/MXX-MYY.
+
+        :param mij: The moment tensor ``[m_rr, m_tt, m_pp, m_rt, m_rp,
+            m_tp]``, already divided by the amplitude of the database.
+        """
+        cos_phi = math.cos(coordinates.phi)
+        sin_phi = math.sin(coordinates.phi)
+        cos_2phi = math.cos(2 * coordinates.phi)
+        sin_2phi = math.sin(2 * coordinates.phi)
+
+        # Scaling of the s, phi and z displacement of each fundamental
+        # source.
+        fac_1 = mij[3] * cos_phi + mij[4] * sin_phi
+        fac_2 = -mij[3] * sin_phi + mij[4] * cos_phi
+        fac_3 = (mij[1] - mij[2]) * cos_2phi + 2 * mij[5] * sin_2phi
+        fac_4 = -(mij[1] - mij[2]) * sin_2phi + 2 * mij[5] * cos_2phi
+        coeffs = np.array([
+            [mij[0], 0.0, mij[0]],
+            [mij[1] + mij[2], 0.0, mij[1] + mij[2]],
+            [fac_1, fac_2, fac_1],
+            [fac_3, fac_4, fac_3]])
+
+        # Projection of the s, phi, z displacement on each component.
+        projection = np.empty((len(components), 3))
+        if "N" in components or "E" in components or "Z" in components:
+            rotmat = rotations.get_rotmat_src_to_NEZ(
+                coordinates.phi, source.longitude_rad, source.colatitude_rad,
+                receiver.longitude_rad, receiver.colatitude_rad)
+        rotmesh_colat = math.atan2(coordinates.s, coordinates.z)
+        for _i, comp in enumerate(components):
+            if comp in "NEZ":
+                projection[_i] = rotmat["NEZ".index(comp)]
+            elif comp == "R":
+                projection[_i] = [math.cos(rotmesh_colat), 0.0,
+                                  -math.sin(rotmesh_colat)]
+            elif comp == "T":
+                # need the - for consistency with reciprocal mode,
+                # need external verification still
+                projection[_i] = [0.0, -1.0, 0.0]
+
+        weights = np.einsum("kj,cj->kjc", coeffs, projection)
+        # The first two sources have no phi displacement.
+        return np.concatenate([weights[0, [0, 2]], weights[1, [0, 2]],
+                               weights[2], weights[3]])
+
     def _get_seismograms(self, source, receiver, components=("Z", "N", "E")):
         """
         Extract seismograms from a netCDF based Instaseis database.
@@ -196,7 +377,8 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
     def _get_strain_interp(self, mesh, id_elem, gll_point_ids, G, GT,
                            col_points_xi, col_points_eta, corner_points,
                            eltype, axis, xi, eta):
-        if id_elem not in mesh.strain_buffer:
+        strain = mesh.strain_buffer.get(id_elem)
+        if strain is None:
             # Single precision in the NetCDF files but the later interpolation
             # routines require double precision. Assignment to this array will
             # force a cast.
@@ -269,14 +451,9 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
                 mesh.ndumps, corner_points, eltype, axis)
 
             mesh.strain_buffer.add(id_elem, strain)
-        else:
-            strain = mesh.strain_buffer.get(id_elem)
-
-        final_strain = np.empty((strain.shape[0], 6), order="F")
 
-        for i in range(6):
-            final_strain[:, i] = spectral_basis.lagrange_interpol_2D_td(
-                col_points_xi, col_points_eta, strain[:, :, :, i], xi, eta)
+        final_strain = spectral_basis.lagrange_interpol_2D_td_multi(
+            col_points_xi, col_points_eta, strain, xi, eta)
 
         if not mesh.excitation_type == "monopole":
             final_strain[:, 3] *= -1.0
@@ -285,7 +462,8 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
         return final_strain
 
     def _get_strain(self, mesh, id_elem):
-        if id_elem not in mesh.strain_buffer:
+        final_strain = mesh.strain_buffer.get(id_elem)
+        if final_strain is None:
             strain_temp = np.zeros((self.info.npts, 6), order="F")
 
             mesh_dict = mesh.f["Snapshots"]
@@ -321,19 +499,23 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
             final_strain[:, 4] = strain_temp[:, 1]
             final_strain[:, 5] = -strain_temp[:, 3]
             mesh.strain_buffer.add(id_elem, final_strain)
-        else:
-            final_strain = mesh.strain_buffer.get(id_elem)
 
         return final_strain
 
     def _get_displacement(self, mesh, id_elem, gll_point_ids, col_points_xi,
                           col_points_eta, xi, eta):
-        if id_elem not in mesh.displ_buffer:
-            utemp = np.zeros((mesh.ndumps, mesh.npol + 1, mesh.npol + 1, 3),
-                             dtype=np.float64, order="F")
-
+        utemp = mesh.displ_buffer.get(id_elem)
+        if utemp is None:
             mesh_dict = mesh.f["Snapshots"]
 
+            # Keep the precision of the file (usually single precision) in
+            # the buffer. The interpolation casts to double precision.
+            dtype = np.result_type(*[
+                mesh_dict[var].dtype for var in ["disp_s", "disp_p", "disp_z"]
+                if var in mesh_dict])
+            utemp = np.zeros((mesh.ndumps, mesh.npol + 1, mesh.npol + 1, 3),
+                             dtype=dtype, order="F")
+
             # Load displacement from all GLL points.
             for i, var in enumerate(["disp_s", "disp_p", "disp_z"]):
                 if var not in mesh_dict:
@@ -366,16 +548,9 @@ class BaseNetCDFInstaseisDB(with_metaclass(ABCMeta, BaseInstaseisDB)):
                                 temp[np.argwhere(s_ids == ids[idx])[0][0], :]
 
             mesh.displ_buffer.add(id_elem, utemp)
-        else:
-            utemp = mesh.displ_buffer.get(id_elem)
-
-        final_displacement = np.empty((utemp.shape[0], 3), order="F")
-
-        for i in range(3):
-            final_displacement[:, i] = spectral_basis.lagrange_interpol_2D_td(
-                col_points_xi, col_points_eta, utemp[:, :, :, i], xi, eta)
 
-        return final_displacement
+        return spectral_basis.lagrange_interpol_2D_td_multi(
+            col_points_xi, col_points_eta, utemp, xi, eta)
 
     def _get_info(self):
         """
@@ -19,7 +19,6 @@ import numpy as np
 
 from .base_netcdf_instaseis_db import BaseNetCDFInstaseisDB
 from . import mesh
-from .. import rotations
 from ..source import Source
 
 
@@ -83,13 +82,8 @@ class ForwardInstaseisDB(BaseNetCDFInstaseisDB):
         # Collect data arrays and mu in a dictionary.
         data = {}
 
-        mesh = self.parsed_mesh.f["Mesh"]
-
-        # Get mu.
-        if not self.read_on_demand:
-            mesh_mu = self.parsed_mesh.mesh_mu
-        else:
-            mesh_mu = mesh["mesh_mu"]
+        # Get mu. Either the array or, if read on demand, the dataset.
+        mesh_mu = self.parsed_mesh.mesh_mu
 
         npol = self.info.spatial_order
         data["mu"] = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
@@ -113,58 +107,17 @@ class ForwardInstaseisDB(BaseNetCDFInstaseisDB):
                                          ei.col_points_eta, ei.xi, ei.eta)
 
         mij = source.tensor / self.parsed_mesh.amplitude
-        # mij is [m_rr, m_tt, m_pp, m_rt, m_rp, m_tp]
-        # final is in s, phi, z coordinates
-        final = np.zeros((displ_1.shape[0], 3), dtype="float64")
-
-        final[:, 0] += displ_1[:, 0] * mij[0]
-        final[:, 2] += displ_1[:, 2] * mij[0]
-
-        final[:, 0] += displ_2[:, 0] * (mij[1] + mij[2])
-        final[:, 2] += displ_2[:, 2] * (mij[1] + mij[2])
-
-        fac_1 = mij[3] * np.cos(coordinates.phi) + \
-            mij[4] * np.sin(coordinates.phi)
-        fac_2 = -mij[3] * np.sin(coordinates.phi) + \
-            mij[4] * np.cos(coordinates.phi)
-
-        final[:, 0] += displ_3[:, 0] * fac_1
-        final[:, 1] += displ_3[:, 1] * fac_2
-        final[:, 2] += displ_3[:, 2] * fac_1
-
-        fac_1 = (mij[1] - mij[2]) * np.cos(2 * coordinates.phi) \
-            + 2 * mij[5] * np.sin(2 * coordinates.phi)
-        fac_2 = -(mij[1] - mij[2]) * np.sin(2 * coordinates.phi) \
-            + 2 * mij[5] * np.cos(2 * coordinates.phi)
-
-        final[:, 0] += displ_4[:, 0] * fac_1
-        final[:, 1] += displ_4[:, 1] * fac_2
-        final[:, 2] += displ_4[:, 2] * fac_1
-
-        rotmesh_colat = np.arctan2(coordinates.s, coordinates.z)
-
-        if "T" in components:
-            # need the - for consistency with reciprocal mode,
-            # need external verification still
-            data["T"] = -final[:, 1]
-
-        if "R" in components:
-            data["R"] = final[:, 0] * np.cos(rotmesh_colat) \
-                        - final[:, 2] * np.sin(rotmesh_colat)
-
-        if "N" in components or "E" in components or "Z" in components:
-            # transpose needed because rotations assume different slicing
-            # (ugly)
-            final = rotations.rotate_vector_src_to_NEZ(
-                final.T, coordinates.phi,
-                source.longitude_rad, source.colatitude_rad,
-                receiver.longitude_rad, receiver.colatitude_rad).T
-
-            if "N" in components:
-                data["N"] = final[:, 0]
-            if "E" in components:
-                data["E"] = final[:, 1]
-            if "Z" in components:
-                data["Z"] = final[:, 2]
+        weights = self._get_forward_weights(mij, source, receiver,
+                                            components, coordinates)
+
+        # Same layout as the merged forward databases.
+        displ = np.column_stack([displ_1[:, [0, 2]], displ_2[:, [0, 2]],
+                                 displ_3, displ_4])
+
+        # (ncomp, npts) so each component is a contiguous row.
+        final = np.dot(weights.T, displ.T)
+
+        for _i, comp in enumerate(components):
+            data[comp] = final[_i]
 
         return data
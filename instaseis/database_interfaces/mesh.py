@@ -57,9 +57,17 @@ class Buffer(object):
     def get(self, key):
         """
         Return an item from the buffer and move it to the end, so it is removed
-        last.
+        last. Returns None if the item is not in the buffer.
+
+        Counts as a hit or fail just like __contains__(), so callers can test
+        and retrieve with a single lookup.
         """
-        value = self._buffer.pop(key)
+        try:
+            value = self._buffer.pop(key)
+        except KeyError:
+            self._fails += 1
+            return None
+        self._hits += 1
         self._buffer[key] = value
         return value
 
@@ -90,8 +98,8 @@ class Buffer(object):
     @property
     def efficiency(self):
         """
-        Return the fraction of calls to the __contains__() routine that
-        returned True.
+        Return the fraction of calls to the __contains__() and get()
+        routines that found the item.
         """
         if (self._hits + self._fails) == 0:
             return 0.0
@@ -294,6 +302,10 @@ class Mesh(object):
                 self.sem_mesh = self.f["Mesh"]["sem_mesh"][:]
                 self.axis = self.f["Mesh"]["axis"][:]
                 self.mesh_mu = self.f["Mesh"]["mesh_mu"][:]
+            else:
+                # Keep a handle to the dataset so it does not have to be
+                # looked up again for every seismogram.
+                self.mesh_mu = self.f["Mesh"]["mesh_mu"]
 
         elif self.dump_type == "fullfields" or self.dump_type == "strain_only":
             # Build a kdtree of the stored gll points.
@@ -309,3 +321,5 @@ class Mesh(object):
 
             if not self.read_on_demand:
                 self.mesh_mu = self.f["Mesh"]["mesh_mu"][:]
+            else:
+                self.mesh_mu = self.f["Mesh"]["mesh_mu"]
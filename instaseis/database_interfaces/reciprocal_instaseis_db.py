@@ -15,7 +15,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import collections
-import numpy as np
+import math
 
 from .base_netcdf_instaseis_db import BaseNetCDFInstaseisDB
 from . import mesh
@@ -108,13 +108,8 @@ class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
         # Collect data arrays and mu in a dictionary.
         data = {}
 
-        mesh = self.parsed_mesh.f["Mesh"]
-
-        # Get mu.
-        if not self.read_on_demand:
-            mesh_mu = self.parsed_mesh.mesh_mu
-        else:
-            mesh_mu = mesh["mesh_mu"]
+        # Get mu. Either the array or, if read on demand, the dataset.
+        mesh_mu = self.parsed_mesh.mesh_mu
         if self.info.dump_type == "displ_only":
             npol = self.info.spatial_order
             mu = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
@@ -123,11 +118,6 @@ class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
             mu = mesh_mu[ei.id_elem]
         data["mu"] = mu
 
-        fac_1_map = {"N": np.cos,
-                     "E": np.sin}
-        fac_2_map = {"N": lambda x: - np.sin(x),
-                     "E": np.cos}
-
         if isinstance(source, Source):
             if self.info.dump_type == 'displ_only':
                 if ei.axis:
@@ -161,61 +151,25 @@ class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
                       self.info.dump_type == 'strain_only'):
                     strain_x = self._get_strain(self.meshes.px, ei.id_elem)
 
-            mij = rotations \
-                .rotate_symm_tensor_voigt_xyz_src_to_xyz_earth(
-                    source.tensor_voigt, np.deg2rad(source.longitude),
-                    np.deg2rad(source.colatitude))
-            mij = rotations \
-                .rotate_symm_tensor_voigt_xyz_earth_to_xyz_src(
-                    mij, np.deg2rad(receiver.longitude),
-                    np.deg2rad(receiver.colatitude))
-            mij = rotations.rotate_symm_tensor_voigt_xyz_to_src(
-                mij, coordinates.phi)
+            mij = rotations.rotate_symm_tensor_voigt_xyz_src_to_src(
+                source.tensor_voigt, math.radians(source.longitude),
+                math.radians(source.colatitude),
+                math.radians(receiver.longitude),
+                math.radians(receiver.colatitude), coordinates.phi,
+                rotmat_receiver=self._get_receiver_rotation(receiver))
             mij /= self.parsed_mesh.amplitude
 
-            if "Z" in components:
-                final = np.zeros(strain_z.shape[0], dtype="float64")
-                for i in range(3):
-                    final += mij[i] * strain_z[:, i]
-                final += 2.0 * mij[4] * strain_z[:, 4]
-                data["Z"] = final
-
-            if "R" in components:
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final -= strain_x[:, 0] * mij[0] * 1.0
-                final -= strain_x[:, 1] * mij[1] * 1.0
-                final -= strain_x[:, 2] * mij[2] * 1.0
-                final -= strain_x[:, 4] * mij[4] * 2.0
-                data["R"] = final
-
-            if "T" in components:
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final += strain_x[:, 3] * mij[3] * 2.0
-                final += strain_x[:, 5] * mij[5] * 2.0
-                data["T"] = final
-
-            for comp in ["E", "N"]:
-                if comp not in components:
-                    continue
-
-                fac_1 = fac_1_map[comp](coordinates.phi)
-                fac_2 = fac_2_map[comp](coordinates.phi)
-
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final += strain_x[:, 0] * mij[0] * 1.0 * fac_1
-                final += strain_x[:, 1] * mij[1] * 1.0 * fac_1
-                final += strain_x[:, 2] * mij[2] * 1.0 * fac_1
-                final += strain_x[:, 3] * mij[3] * 2.0 * fac_2
-                final += strain_x[:, 4] * mij[4] * 2.0 * fac_1
-                final += strain_x[:, 5] * mij[5] * 2.0 * fac_2
-                if comp == "N":
-                    final *= -1.0
-                data[comp] = final
+            weights = self._get_strain_weights(
+                mij, coordinates.phi, components)
+            self._apply_weights(weights, strain_x, strain_z, data)
 
         elif isinstance(source, ForceSource):
             if self.info.dump_type != 'displ_only':
                 raise ValueError("Force sources only in displ_only mode")
 
+            displ_x = None
+            displ_z = None
+
             if "Z" in components:
                 displ_z = self._get_displacement(self.meshes.pz, ei.id_elem,
                                                  ei.gll_point_ids,
@@ -231,46 +185,18 @@ class ReciprocalInstaseisDB(BaseNetCDFInstaseisDB):
                                                  ei.eta)
 
             force = rotations.rotate_vector_xyz_src_to_xyz_earth(
-                source.force_tpr, np.deg2rad(source.longitude),
-                np.deg2rad(source.colatitude))
+                source.force_tpr, math.radians(source.longitude),
+                math.radians(source.colatitude))
             force = rotations.rotate_vector_xyz_earth_to_xyz_src(
-                force, np.deg2rad(receiver.longitude),
-                np.deg2rad(receiver.colatitude))
+                force, math.radians(receiver.longitude),
+                math.radians(receiver.colatitude))
             force = rotations.rotate_vector_xyz_to_src(
                 force, coordinates.phi)
             force /= self.parsed_mesh.amplitude
 
-            if "Z" in components:
-                final = np.zeros(displ_z.shape[0], dtype="float64")
-                final += displ_z[:, 0] * force[0]
-                final += displ_z[:, 2] * force[2]
-                data["Z"] = final
-
-            if "R" in components:
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 0] * force[0]
-                final += displ_x[:, 2] * force[2]
-                data["R"] = final
-
-            if "T" in components:
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 1] * force[1]
-                data["T"] = final
-
-            for comp in ["E", "N"]:
-                if comp not in components:
-                    continue
-
-                fac_1 = fac_1_map[comp](coordinates.phi)
-                fac_2 = fac_2_map[comp](coordinates.phi)
-
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 0] * force[0] * fac_1
-                final += displ_x[:, 1] * force[1] * fac_2
-                final += displ_x[:, 2] * force[2] * fac_1
-                if comp == "N":
-                    final *= -1.0
-                data[comp] = final
+            weights = self._get_displacement_weights(
+                force, coordinates.phi, components)
+            self._apply_weights(weights, displ_x, displ_z, data)
 
         else:
             raise NotImplementedError
@@ -15,6 +15,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import collections
+import math
 import numpy as np
 
 from .base_netcdf_instaseis_db import BaseNetCDFInstaseisDB
@@ -71,13 +72,8 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
         # Collect data arrays and mu in a dictionary.
         data = {}
 
-        mesh = self.parsed_mesh.f["Mesh"]
-
-        # Get mu.
-        if not self.read_on_demand:
-            mesh_mu = self.parsed_mesh.mesh_mu
-        else:
-            mesh_mu = mesh["mesh_mu"]
+        # Get mu. Either the array or, if read on demand, the dataset.
+        mesh_mu = self.parsed_mesh.mesh_mu
         if self.info.dump_type == "displ_only":
             npol = self.info.spatial_order
             mu = mesh_mu[ei.gll_point_ids[npol // 2, npol // 2]]
@@ -89,11 +85,6 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
             mu = mesh_mu[ei.id_elem]
         data["mu"] = mu
 
-        fac_1_map = {"N": np.cos,
-                     "E": np.sin}
-        fac_2_map = {"N": lambda x: - np.sin(x),
-                     "E": np.cos}
-
         if isinstance(source, Source):
             if self.info.dump_type == 'displ_only':
                 if ei.axis:
@@ -107,63 +98,27 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
                 strain_x, strain_z = self._get_strain_interp(
                     ei.id_elem, ei.gll_point_ids, G, GT,
                     ei.col_points_xi, ei.col_points_eta, ei.corner_points,
-                    ei.eltype, ei.axis, ei.xi, ei.eta)
+                    ei.eltype, ei.axis, ei.xi, ei.eta,
+                    needs_x=any(comp in components
+                                for comp in ['N', 'E', 'R', 'T']),
+                    needs_z="Z" in components)
             elif (self.info.dump_type == 'fullfields' or
                   self.info.dump_type == 'strain_only'):  # pragma: no cover
                 # Merged databases currently not implemented for
                 # non-displacement databases.
                 raise NotImplementedError
 
-            mij = rotations \
-                .rotate_symm_tensor_voigt_xyz_src_to_xyz_earth(
-                    source.tensor_voigt, np.deg2rad(source.longitude),
-                    np.deg2rad(source.colatitude))
-            mij = rotations \
-                .rotate_symm_tensor_voigt_xyz_earth_to_xyz_src(
-                    mij, np.deg2rad(receiver.longitude),
-                    np.deg2rad(receiver.colatitude))
-            mij = rotations.rotate_symm_tensor_voigt_xyz_to_src(
-                mij, coordinates.phi)
+            mij = rotations.rotate_symm_tensor_voigt_xyz_src_to_src(
+                source.tensor_voigt, math.radians(source.longitude),
+                math.radians(source.colatitude),
+                math.radians(receiver.longitude),
+                math.radians(receiver.colatitude), coordinates.phi,
+                rotmat_receiver=self._get_receiver_rotation(receiver))
             mij /= self.parsed_mesh.amplitude
 
-            if "Z" in components:
-                final = np.zeros(strain_z.shape[0], dtype="float64")
-                for i in range(3):
-                    final += mij[i] * strain_z[:, i]
-                final += 2.0 * mij[4] * strain_z[:, 4]
-                data["Z"] = final
-
-            if "R" in components:
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final -= strain_x[:, 0] * mij[0] * 1.0
-                final -= strain_x[:, 1] * mij[1] * 1.0
-                final -= strain_x[:, 2] * mij[2] * 1.0
-                final -= strain_x[:, 4] * mij[4] * 2.0
-                data["R"] = final
-
-            if "T" in components:
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final += strain_x[:, 3] * mij[3] * 2.0
-                final += strain_x[:, 5] * mij[5] * 2.0
-                data["T"] = final
-
-            for comp in ["E", "N"]:
-                if comp not in components:
-                    continue
-
-                fac_1 = fac_1_map[comp](coordinates.phi)
-                fac_2 = fac_2_map[comp](coordinates.phi)
-
-                final = np.zeros(strain_x.shape[0], dtype="float64")
-                final += strain_x[:, 0] * mij[0] * 1.0 * fac_1
-                final += strain_x[:, 1] * mij[1] * 1.0 * fac_1
-                final += strain_x[:, 2] * mij[2] * 1.0 * fac_1
-                final += strain_x[:, 3] * mij[3] * 2.0 * fac_2
-                final += strain_x[:, 4] * mij[4] * 2.0 * fac_1
-                final += strain_x[:, 5] * mij[5] * 2.0 * fac_2
-                if comp == "N":
-                    final *= -1.0
-                data[comp] = final
+            weights = self._get_strain_weights(
+                mij, coordinates.phi, components)
+            self._apply_weights(weights, strain_x, strain_z, data)
 
         elif isinstance(source, ForceSource):
             if self.info.dump_type != 'displ_only':  # pragma: no cover
@@ -177,46 +132,18 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
                 ei.col_points_eta, ei.xi, ei.eta)
 
             force = rotations.rotate_vector_xyz_src_to_xyz_earth(
-                source.force_tpr, np.deg2rad(source.longitude),
-                np.deg2rad(source.colatitude))
+                source.force_tpr, math.radians(source.longitude),
+                math.radians(source.colatitude))
             force = rotations.rotate_vector_xyz_earth_to_xyz_src(
-                force, np.deg2rad(receiver.longitude),
-                np.deg2rad(receiver.colatitude))
+                force, math.radians(receiver.longitude),
+                math.radians(receiver.colatitude))
             force = rotations.rotate_vector_xyz_to_src(
                 force, coordinates.phi)
             force /= self.parsed_mesh.amplitude
 
-            if "Z" in components:
-                final = np.zeros(displ_z.shape[0], dtype="float64")
-                final += displ_z[:, 0] * force[0]
-                final += displ_z[:, 2] * force[2]
-                data["Z"] = final
-
-            if "R" in components:
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 0] * force[0]
-                final += displ_x[:, 2] * force[2]
-                data["R"] = final
-
-            if "T" in components:
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 1] * force[1]
-                data["T"] = final
-
-            for comp in ["E", "N"]:
-                if comp not in components:
-                    continue
-
-                fac_1 = fac_1_map[comp](coordinates.phi)
-                fac_2 = fac_2_map[comp](coordinates.phi)
-
-                final = np.zeros(displ_x.shape[0], dtype="float64")
-                final += displ_x[:, 0] * force[0] * fac_1
-                final += displ_x[:, 1] * force[1] * fac_2
-                final += displ_x[:, 2] * force[2] * fac_1
-                if comp == "N":
-                    final *= -1.0
-                data[comp] = final
+            weights = self._get_displacement_weights(
+                force, coordinates.phi, components)
+            self._apply_weights(weights, displ_x, displ_z, data)
 
         else:
             raise NotImplementedError
@@ -227,118 +154,111 @@ class ReciprocalMergedInstaseisDB(BaseNetCDFInstaseisDB):
         # We can now read it in a single go!
         utemp = self.meshes.merged.f["MergedSnapshots"][id_elem]
 
-        # utemp is currently (nvars, jpol, ipol, npts)
-        # 1. Roll to (npts, nvar, jpol, ipol)
-        utemp = np.rollaxis(utemp, 3, 0)
-        # 2. Roll to (npts, jpol, nvar, ipol)
-        utemp = np.rollaxis(utemp, 2, 1)
-        # 3. Roll to (npts, jpol, ipol, nvar)
-        utemp = np.rollaxis(utemp, 3, 2)
+        # utemp is currently (nvars, jpol, ipol, npts). Reorder to
+        # (npts, jpol, ipol, nvar) and make it Fortran contiguous in a single
+        # copy so the per component slices can directly be passed on.
+        utemp = np.asfortranarray(utemp.transpose(3, 1, 2, 0))
 
         return utemp
 
+    @staticmethod
+    def _get_utemp_z(utemp):
+        """
+        The vertical database expects disp_s at index 0 and disp_z at index
+        2. They are the last two variables of the merged snapshots both for
+        vertical only and for databases with all five components.
+
+        This returns a new array and never modifies utemp, which might be
+        owned by the displacement buffer.
+        """
+        utemp_z = np.empty(utemp.shape[:3] + (3,), dtype=np.float64,
+                           order="F")
+        utemp_z[:, :, :, 0] = utemp[:, :, :, -2]
+        utemp_z[:, :, :, 1] = 0.0
+        utemp_z[:, :, :, 2] = utemp[:, :, :, -1]
+        return utemp_z
+
     def _get_strain_interp(self, id_elem, gll_point_ids, G, GT,
                            col_points_xi, col_points_eta, corner_points,
-                           eltype, axis, xi, eta):
+                           eltype, axis, xi, eta, needs_x=True, needs_z=True):
+        """
+        Returns the interpolated strain of the horizontal and vertical
+        database. A half that is not needed is not computed and returned as
+        None.
+
+        Both halves are buffered separately so a later request for the other
+        half can still make use of the buffer.
+        """
         mesh = self.meshes.merged
-        if id_elem not in mesh.strain_buffer:
-            utemp = self._get_and_reorder_utemp(id_elem)
 
-            strain_fct_map = {
-                "monopole": sem_derivatives.strain_monopole_td,
-                "dipole": sem_derivatives.strain_dipole_td,
-                "quadpole": sem_derivatives.strain_quadpole_td}
-
-            # We want the cache to work - thus we always have to
-            # calculate both! Also I/O is the slow part here.
-
-            # Horizontal component is available if we have 3 or 5 components.
-            if utemp.shape[-1] >= 3:
-                utemp_x = utemp[:, :, :, :3]
-                utemp_x = np.require(utemp_x, requirements=["F"],
-                                     dtype=np.float64)
-                strain_x = strain_fct_map["dipole"](
-                    utemp_x, G, GT, col_points_xi, col_points_eta,
-                    mesh.npol, mesh.ndumps, corner_points, eltype, axis)
-            else:
-                strain_x = None
-
-            # Vertical component is available if we have 2 or 5 components.
-            if utemp.shape[-1] in (2, 5):
-                # Vertical expects disp_s at index 0 and disp_z at index 2.
-                # Expand if only vertical.
-                _s = list(utemp.shape)
-                if _s[-1] == 2:
-                    _s[-1] = 3
-                    utemp_new = np.zeros(_s, dtype=utemp.dtype)
-                    utemp_new[:, :, :, 0] = utemp[:, :, :, 0]
-                    utemp_new[:, :, :, 2] = utemp[:, :, :, 1]
-                    utemp_z = utemp_new
-                # Reform all others.
-                else:
-                    utemp_z = utemp[:, :, :, -3:]
-                    utemp_z[:, :, :, 0] = utemp_z[:, :, :, 1]
-                    utemp_z[:, :, :, 1][:] = 0
-                    utemp_z = np.require(utemp_z, requirements=["F"],
-                                         dtype=np.float64)
-
-                strain_z = strain_fct_map["monopole"](
-                    utemp_z, G, GT, col_points_xi, col_points_eta,
-                    mesh.npol, mesh.ndumps, corner_points, eltype, axis)
-            else:
-                strain_z = None
-
-            mesh.strain_buffer.add(id_elem, (strain_x, strain_z))
-        else:
-            strain_x, strain_z = mesh.strain_buffer.get(id_elem)
+        strain_fct_map = {
+            "monopole": sem_derivatives.strain_monopole_td,
+            "dipole": sem_derivatives.strain_dipole_td,
+            "quadpole": sem_derivatives.strain_quadpole_td}
 
+        utemp = None
         all_strains = {}
-        for name, strain in (("strain_x", strain_x), ("strain_z", strain_z)):
-            if strain is None:
+        for name, needed in (("x", needs_x), ("z", needs_z)):
+            if not needed:
                 all_strains[name] = None
                 continue
-            final_strain = np.empty((strain.shape[0], 6), order="F")
 
-            for i in range(6):
-                final_strain[:, i] = spectral_basis.lagrange_interpol_2D_td(
-                    col_points_xi, col_points_eta, strain[:, :, :, i], xi, eta)
+            strain = mesh.strain_buffer.get((id_elem, name))
+            if strain is None:
+                # I/O is the slow part here, so read at most once.
+                if utemp is None:
+                    utemp = self._get_and_reorder_utemp(id_elem)
+
+                if name == "x":
+                    utemp_x = np.require(utemp[:, :, :, :3],
+                                         requirements=["F"], dtype=np.float64)
+                    strain = strain_fct_map["dipole"](
+                        utemp_x, G, GT, col_points_xi, col_points_eta,
+                        mesh.npol, mesh.ndumps, corner_points, eltype, axis)
+                else:
+                    strain = strain_fct_map["monopole"](
+                        self._get_utemp_z(utemp), G, GT, col_points_xi,
+                        col_points_eta, mesh.npol, mesh.ndumps,
+                        corner_points, eltype, axis)
+
+                mesh.strain_buffer.add((id_elem, name), strain)
+
+            final_strain = spectral_basis.lagrange_interpol_2D_td_multi(
+                col_points_xi, col_points_eta, strain, xi, eta)
 
-            if not name == "strain_z":
+            if name == "x":
                 final_strain[:, 3] *= -1.0
                 final_strain[:, 5] *= -1.0
 
             all_strains[name] = final_strain
 
-        return all_strains["strain_x"], all_strains["strain_z"]
+        return all_strains["x"], all_strains["z"]
 
     def _get_displacement(self, id_elem, gll_point_ids,
                           col_points_xi, col_points_eta, xi, eta):
         mesh = self.meshes.merged
-        if id_elem not in mesh.displ_buffer:
+        utemp = mesh.displ_buffer.get(id_elem)
+        if utemp is None:
             utemp = self._get_and_reorder_utemp(id_elem)
             mesh.displ_buffer.add(id_elem, utemp)
+
+        # Horizontal component is available if we have 3 or 5 components.
+        if utemp.shape[-1] >= 3:
+            utemp_x = np.require(utemp[:, :, :, :3], requirements=["F"],
+                                 dtype=np.float64)
+            final_displacement_x = \
+                spectral_basis.lagrange_interpol_2D_td_multi(
+                    col_points_xi, col_points_eta, utemp_x, xi, eta)
+        else:
+            final_displacement_x = None
+
+        # Vertical component is available if we have 2 or 5 components.
+        if utemp.shape[-1] in (2, 5):
+            final_displacement_z = \
+                spectral_basis.lagrange_interpol_2D_td_multi(
+                    col_points_xi, col_points_eta, self._get_utemp_z(utemp),
+                    xi, eta)
         else:
-            utemp = mesh.displ_buffer.get(id_elem)
-
-        final_displacement_x = np.empty((utemp.shape[0], 3), order="F")
-        utemp_x = utemp[:, :, :, :3]
-        utemp_x = np.require(utemp_x, requirements=["F"],
-                             dtype=np.float64)
-        for i in range(3):
-            final_displacement_x[:, i] = \
-                spectral_basis.lagrange_interpol_2D_td(
-                    col_points_xi, col_points_eta,
-                    utemp_x[:, :, :, i], xi, eta)
-
-        utemp_z = utemp[:, :, :, -3:]
-        utemp_z[:, :, :, 0] = utemp_z[:, :, :, 1]
-        utemp_z[:, :, :, 1][:] = 0
-        utemp_z = np.require(utemp_z, requirements=["F"], dtype=np.float64)
-        final_displacement_z = np.empty((utemp.shape[0], 3), order="F")
-        for i in range(3):
-            final_displacement_z[:, i] = \
-                spectral_basis.lagrange_interpol_2D_td(
-                    col_points_xi, col_points_eta,
-                    utemp_z[:, :, :, i], xi, eta)
+            final_displacement_z = None
 
         return final_displacement_x, final_displacement_z
@@ -13,7 +13,6 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
 import ctypes as C
-import glob
 import inspect
 import math
 import os
@@ -24,49 +23,120 @@ import numpy as np
 LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(
     inspect.getfile(inspect.currentframe()))), "lib")
 
-cache = []
+# Handle of the shared library once it has been loaded.
+_LIB = None
+
+# Upper bounds of the sampling intervals of the band codes for arrays of
+# sampling intervals. The band code is "M" for dt < 1, which is the same as
+# dt <= the next smaller float.
+_BAND_CODE_THRESHOLDS = np.array([0.001, 0.004, 0.0125, 0.1,
+                                  np.nextafter(1.0, 0.0)])
+_BAND_CODES = ("F", "C", "H", "B", "M", "L")
+
+# Axes and 1 - e^2 of the WGS84 ellipsoid. Precomputed as these are the
+# defaults of the latitude conversions.
+WGS84_A = 6378137.0
+WGS84_B = 6356752.314245
+_WGS84_F = (WGS84_A - WGS84_B) / WGS84_A
+_WGS84_E2 = 2 * _WGS84_F - _WGS84_F ** 2
+_WGS84_1ME2 = 1 - _WGS84_E2
 
 
 def load_lib():
-    if cache:
-        return cache[0]
-    else:
-        # Enable a couple of different library naming schemes.
-        possible_files = glob.glob(os.path.join(LIB_DIR, "instaseis*.so"))
-        if not possible_files:  # pragma: no cover
-            raise ValueError("Could not find suitable instaseis shared "
-                             "library.")
-        filename = possible_files[0]
-        lib = C.CDLL(filename)
-        cache.append(lib)
-        return lib
+    global _LIB
+    if _LIB is not None:
+        return _LIB
+
+    # Enable a couple of different library naming schemes.
+    try:
+        possible_files = [
+            _i for _i in os.listdir(LIB_DIR)
+            if _i.startswith("instaseis") and _i.endswith(".so")]
+    except OSError:  # pragma: no cover
+        possible_files = []
+    if not possible_files:  # pragma: no cover
+        raise ValueError("Could not find suitable instaseis shared "
+                         "library.")
+    _LIB = C.CDLL(os.path.join(LIB_DIR, possible_files[0]))
+    return _LIB
 
 
 def get_band_code(dt):
     """
     Figure out the channel band code. Done as in SPECFEM.
+
+    Also works with an array of sampling intervals in which case an array of
+    band codes is returned.
+    """
+    # Plain comparisons are much faster than numpy for single values.
+    if isinstance(dt, (float, int)) or not np.ndim(dt):
+        if dt <= 0.001:
+            band_code = "F"
+        elif dt <= 0.004:
+            band_code = "C"
+        elif dt <= 0.0125:
+            band_code = "H"
+        elif dt <= 0.1:
+            band_code = "B"
+        elif dt < 1:
+            band_code = "M"
+        else:
+            band_code = "L"
+        return band_code
+
+    idx = np.searchsorted(_BAND_CODE_THRESHOLDS, dt, side="left")
+    return np.array(_BAND_CODES)[idx]
+
+
+def _get_one_minus_e2(axis_a, axis_b):
     """
-    if dt <= 0.001:
-        band_code = "F"
-    elif dt <= 0.004:
-        band_code = "C"
-    elif dt <= 0.0125:
-        band_code = "H"
-    elif dt <= 0.1:
-        band_code = "B"
-    elif dt < 1:
-        band_code = "M"
+    Returns 1 - e^2 with e being the first eccentricity of the ellipsoid.
+    """
+    if axis_a == WGS84_A and axis_b == WGS84_B:
+        return _WGS84_1ME2
+    _f = (axis_a - axis_b) / axis_a
+    return 1 - (2 * _f - _f ** 2)
+
+
+def _lat_convert(lat, one_minus_e2, inverse=False):
+    """
+    Shared implementation of the latitude conversions. Scales the tangent of
+    the latitude by 1 - e^2 or, if inverse is True, divides it by 1 - e^2.
+
+    Latitudes close to the poles and the equator are singular and returned
+    unchanged. Works on scalars and arrays.
+    """
+    # Check for plain numbers first as np.ndim() is slow compared to the
+    # actual conversion of a single value.
+    if not isinstance(lat, (float, int)) and np.ndim(lat):
+        lat = np.asarray(lat, dtype=np.float64)
+        tan_lat = np.tan(np.radians(lat))
+        if inverse:
+            tan_lat /= one_minus_e2
+        else:
+            tan_lat *= one_minus_e2
+        abs_lat = np.abs(lat)
+        return np.where((abs_lat < 1E-6) | (np.abs(abs_lat - 90.0) < 1E-6),
+                        lat, np.degrees(np.arctan(tan_lat)))
+
+    abs_lat = abs(lat)
+    if abs_lat < 1E-6 or abs(abs_lat - 90.0) < 1E-6:
+        return lat
+
+    tan_lat = math.tan(math.radians(lat))
+    if inverse:
+        tan_lat /= one_minus_e2
     else:
-        band_code = "L"
-    return band_code
+        tan_lat *= one_minus_e2
+    return math.degrees(math.atan(tan_lat))
 
 
-def elliptic_to_geocentric_latitude(lat, axis_a=6378137.0,
-                                    axis_b=6356752.314245):
+def elliptic_to_geocentric_latitude(lat, axis_a=WGS84_A, axis_b=WGS84_B):
     """
     Convert a latitude defined on an ellipsoid to a geocentric one.
 
-    :param lat: The latitude to convert.
+    :param lat: The latitude to convert. Can also be an array of
+        latitudes.
     :param axis_a: The length of the major axis of the planet. Defaults to
         the value of the WGS84 ellipsoid.
     :param axis_b: The length of the minor axis of the planet. Defaults to
@@ -83,24 +153,15 @@ def elliptic_to_geocentric_latitude(lat, axis_a=6378137.0,
     >>> elliptic_to_geocentric_latitude(-45.0)
     -44.80757678401642
     """
-    _f = (axis_a - axis_b) / axis_a
-    E_2 = 2 * _f - _f ** 2
-
-    # Singularities close to the pole and the equator. Just return the value
-    # in that case.
-    if abs(lat) < 1E-6 or abs(lat - 90) < 1E-6 or \
-            abs(lat + 90.0) < 1E-6:
-        return lat
+    return _lat_convert(lat, _get_one_minus_e2(axis_a, axis_b))
 
-    return math.degrees(math.atan((1 - E_2) * math.tan(math.radians(lat))))
 
-
-def geocentric_to_elliptic_latitude(lat, axis_a=6378137.0,
-                                    axis_b=6356752.314245):
+def geocentric_to_elliptic_latitude(lat, axis_a=WGS84_A, axis_b=WGS84_B):
     """
     Convert a geocentric latitude to one defined on an ellipsoid.
 
-    :param lat: The latitude to convert.
+    :param lat: The latitude to convert. Can also be an array of
+        latitudes.
     :param axis_a: The length of the major axis of the planet. Defaults to
         the value of the WGS84 ellipsoid.
     :param axis_b: The length of the minor axis of the planet. Defaults to
@@ -117,16 +178,8 @@ def geocentric_to_elliptic_latitude(lat, axis_a=6378137.0,
     >>> geocentric_to_elliptic_latitude(-45.0)
     -45.19242321598358
     """
-    _f = (axis_a - axis_b) / axis_a
-    E_2 = 2 * _f - _f ** 2
-
-    # Singularities close to the pole and the equator. Just return the value
-    # in that case.
-    if abs(lat) < 1E-6 or abs(lat - 90) < 1E-6 or \
-            abs(lat + 90.0) < 1E-6:
-        return lat
-
-    return math.degrees(math.atan(math.tan(math.radians(lat)) / (1 - E_2)))
+    return _lat_convert(lat, _get_one_minus_e2(axis_a, axis_b),
+                        inverse=True)
 
 
 def sizeof_fmt(num):
@@ -135,11 +188,23 @@ def sizeof_fmt(num):
 
     From http://stackoverflow.com/a/1094933/1657047
     """
-    for x in ["bytes", "KB", "MB", "GB"]:
-        if num < 1024.0 and num > -1024.0:
-            return "%3.1f %s" % (num, x)
-        num /= 1024.0
-    return "%3.1f %s" % (num, "TB")
+    units = ("bytes", "KB", "MB", "GB", "TB")
+    n = abs(num)
+    if n < 1024.0:
+        exp = 0
+    elif n != n or n == float("inf"):
+        # NaN and infinity end up in the largest unit like with the loop.
+        exp = 4
+    else:
+        # frexp() gives the exact binary exponent, no rounding issues as
+        # with log() close to the powers of 1024.
+        exp = min(4, (math.frexp(n)[1] - 1) // 10)
+    return "%3.1f %s" % (num / float(1 << (10 * exp)), units[exp])
+
+
+# Below this number of indices a plain loop is faster than numpy. A single
+# element, which is what _get_strain_interp() passes, has only 25 indices.
+_IO_CHUNKER_LOOP_MAX = 128
 
 
 def io_chunker(arr):
@@ -147,30 +212,52 @@ def io_chunker(arr):
     Assumes arr is an array of indices. Will return indices thus that
     adjacent items can be read in one go. Much faster for some cases!
     """
-    idx = []
-    for _i in range(len(arr)):
-        if _i == 0:
-            idx.append(arr[_i])
-            continue
-        diff = arr[_i] - arr[_i - 1]
-        if diff == 1:
-            if isinstance(idx[-1], list):
-                idx[-1][-1] += 1
+    if len(arr) < _IO_CHUNKER_LOOP_MAX:
+        if isinstance(arr, np.ndarray):
+            arr = arr.tolist()
+        idx = []
+        for _i in range(len(arr)):
+            if _i and arr[_i] - arr[_i - 1] == 1:
+                if isinstance(idx[-1], list):
+                    idx[-1][-1] += 1
+                else:
+                    idx[-1] = [idx[-1], idx[-1] + 2]
             else:
-                idx[-1] = [idx[-1], idx[-1] + 2]
-        else:
-            idx.append(arr[_i])
-    return idx
+                idx.append(arr[_i])
+        return idx
+
+    # Find the first and last index of each run of consecutive indices.
+    arr = np.asarray(arr)
+    breaks = np.flatnonzero(np.diff(arr) != 1) + 1
+    starts = arr[np.concatenate([[0], breaks])].tolist()
+    stops = arr[np.concatenate([breaks - 1, [len(arr) - 1]])].tolist()
+    return [start if start == stop else [start, stop + 1]
+            for start, stop in zip(starts, stops)]
 
 
-def rfftfreq(n, d=1.0):  # pragma: no cover
+# Cache of rfftfreq() results. Usually only a handful of different FFT
+# lengths are in use so it is simply cleared once it gets too large.
+_rfftfreq_cache = {}
+_RFFTFREQ_CACHE_SIZE = 32
+
+
+def rfftfreq(n, d=1.0):
     """
-    Polyfill for numpy's rfftfreq() for numpy versions that don't have it.
+    Same as numpy's rfftfreq() which is not available in older numpy
+    versions.
+
+    The results are cached per (n, d) and are thus returned as read-only
+    arrays.
     """
-    if hasattr(np.fft, "rfftfreq"):
-        return np.fft.rfftfreq(n=n, d=d)
+    key = (n, d)
+    freqs = _rfftfreq_cache.get(key)
+    if freqs is not None:
+        return freqs
+
+    freqs = np.arange(n // 2 + 1, dtype=np.float64) * (1.0 / (n * d))
+    freqs.setflags(write=False)
 
-    val = 1.0 / (n * d)
-    N = n // 2 + 1
-    results = np.arange(0, N, dtype=int)
-    return results * val
+    if len(_rfftfreq_cache) >= _RFFTFREQ_CACHE_SIZE:
+        _rfftfreq_cache.clear()
+    _rfftfreq_cache[key] = freqs
+    return freqs
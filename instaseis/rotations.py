@@ -13,6 +13,8 @@ Functions dealing with rotations.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import math
+
 import numpy as np
 
 
@@ -138,6 +140,103 @@ def rotate_symm_tensor_voigt_xyz_to_src(mt, phi):
     return np.array([B[0, 0], B[1, 1], B[2, 2], B[1, 2], B[0, 2], B[0, 1]])
 
 
+# Row and column indices of the voigt components and from them the flat
+# indices into a 3x3 matrix needed to assemble the bond matrix.
+_VOIGT_I = np.array([0, 1, 2, 1, 0, 0])
+_VOIGT_J = np.array([0, 1, 2, 2, 2, 1])
+_BOND_II = 3 * _VOIGT_I[:, np.newaxis] + _VOIGT_I
+_BOND_JJ = 3 * _VOIGT_J[:, np.newaxis] + _VOIGT_J
+_BOND_IJ = 3 * _VOIGT_I[:, np.newaxis] + _VOIGT_J
+_BOND_JI = 3 * _VOIGT_J[:, np.newaxis] + _VOIGT_I
+# Diagonal elements only appear once in the tensor.
+_BOND_SCALE = np.array([0.5, 0.5, 0.5, 1.0, 1.0, 1.0])
+
+
+def voigt_bond_matrix(rotmat):
+    """
+    Bond matrix of a 3x3 rotation matrix for symmetric tensors in voigt
+    notation without the factor of 2 on the off-diagonal elements, i.e. for
+    the voigt vector a of the tensor A:
+
+    voigt(R.A.Rt) = M.a
+    """
+    R = np.ravel(rotmat)
+    return (R[_BOND_II] * R[_BOND_JJ] + R[_BOND_IJ] * R[_BOND_JI]) * \
+        _BOND_SCALE
+
+
+def compose_voigt_rotation(srclon, srccolat, reclon, reccolat, phi,
+                           rotmat_receiver=None):
+    """
+    Bond matrix combining rotate_symm_tensor_voigt_xyz_src_to_xyz_earth,
+    rotate_symm_tensor_voigt_xyz_earth_to_xyz_src and
+    rotate_symm_tensor_voigt_xyz_to_src in a single 6x6 matrix.
+
+    The rotation from earth to the receiver system only depends on the
+    receiver. It can be passed as rotmat_receiver (as returned by
+    get_rotmat_xyz_earth_to_xyz_src()) to reuse it for many sources.
+
+    As the source tensor components might differ by many orders of
+    magnitude, the matrix is returned in quad precision.
+    """
+    if rotmat_receiver is None:
+        rotmat_receiver = get_rotmat_xyz_earth_to_xyz_src(reclon, reccolat)
+    rotmat = np.dot(get_rotmat_xyz_to_src(phi), np.dot(
+        rotmat_receiver, get_rotmat_xyz_src_to_xyz_earth(srclon, srccolat)))
+    return voigt_bond_matrix(np.require(rotmat, dtype=np.float128))
+
+
+def rotate_symm_tensor_voigt_xyz_src_to_src(mt, srclon, srccolat, reclon,
+                                            reccolat, phi,
+                                            rotmat_receiver=None):
+    """
+    rotates a tensor from a cartesian system xyz with z axis aligned with the
+    source to the AxiSEM s, phi, z system aligned with the receiver on the
+    s = 0 axis. Same as applying rotate_symm_tensor_voigt_xyz_src_to_xyz_earth,
+    rotate_symm_tensor_voigt_xyz_earth_to_xyz_src and
+    rotate_symm_tensor_voigt_xyz_to_src in turn.
+    """
+    M = compose_voigt_rotation(srclon, srccolat, reclon, reccolat, phi,
+                               rotmat_receiver=rotmat_receiver)
+    return np.require(np.dot(M, np.require(mt, dtype=np.float128)),
+                      dtype=np.float64)
+
+
+# The rotation matrices of rotate_vector_xyz_earth_to_xyz_src,
+# rotate_vector_xyz_src_to_xyz_earth and rotate_vector_xyz_to_src for a
+# single set of angles. Built directly with scalar trigonometry as they are
+# needed for every source.
+def get_rotmat_xyz_earth_to_xyz_src(phi, theta):
+    sp = math.sin(phi)
+    cp = math.cos(phi)
+    st = math.sin(theta)
+    ct = math.cos(theta)
+
+    return np.array([[cp * ct, ct * sp, -st],
+                     [-sp, cp, 0.0],
+                     [cp * st, sp * st, ct]])
+
+
+def get_rotmat_xyz_src_to_xyz_earth(phi, theta):
+    sp = math.sin(phi)
+    cp = math.cos(phi)
+    st = math.sin(theta)
+    ct = math.cos(theta)
+
+    return np.array([[cp * ct, -sp, cp * st],
+                     [ct * sp, cp, sp * st],
+                     [-st, 0.0, ct]])
+
+
+def get_rotmat_xyz_to_src(phi):
+    sp = math.sin(phi)
+    cp = math.cos(phi)
+
+    return np.array([[cp, sp, 0.0],
+                     [-sp, cp, 0.0],
+                     [0.0, 0.0, 1.0]])
+
+
 def rotate_vector_xyz_earth_to_xyz_src(vec, phi, theta):
     sp = np.sin(phi)
     cp = np.cos(phi)
@@ -180,13 +279,19 @@ def rotate_vector_src_to_xyz(vec, phi):
                      vec[2]])
 
 
-def rotate_vector_src_to_NEZ(vec, phi, srclon, srccolat, reclon, reccolat):
+def get_rotmat_src_to_NEZ(phi, srclon, srccolat, reclon, reccolat):
     rotmat = np.eye(3)
     rotmat = rotate_vector_src_to_xyz(rotmat, phi)
     rotmat = rotate_vector_xyz_src_to_xyz_earth(rotmat, srclon, srccolat)
     rotmat = rotate_vector_xyz_earth_to_xyz_src(rotmat, reclon, reccolat)
     rotmat[0, :] *= -1  # N = - theta
 
+    return rotmat
+
+
+def rotate_vector_src_to_NEZ(vec, phi, srclon, srccolat, reclon, reccolat):
+    rotmat = get_rotmat_src_to_NEZ(phi, srclon, srccolat, reclon, reccolat)
+
     return np.dot(rotmat, vec)
 
 
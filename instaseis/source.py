@@ -23,7 +23,6 @@ from obspy.signal.filter import lowpass
 from obspy.signal.util import next_pow_2
 import obspy.io.xseed.parser
 import os
-from scipy import interp
 
 from . import ReceiverParseError, SourceParseError
 from . import rotations
@@ -195,6 +194,65 @@ def asymmetric_cosine(trise, tfall=None, npts=10000, dt=0.1):
     return asc
 
 
+# Cache of the interpolation tables of _resample_linear(). Usually all
+# sliprates are resampled to the sampling of the database, so only a few
+# tables are in use. It is simply cleared once it gets too large.
+_resample_tables_cache = {}
+_RESAMPLE_TABLES_CACHE_SIZE = 64
+
+
+def _get_resample_tables(dt, nsamp, dt_old, nsamp_old):
+    """
+    Returns the indices and weights to linearly interpolate nsamp_old
+    samples with a sampling of dt_old to nsamp samples with a sampling of
+    dt, both starting at zero. Values outside the old time range are clamped
+    to the first and last sample, just like numpy.interp().
+
+    The tables are cached and thus returned as read-only arrays.
+    """
+    key = (dt, nsamp, dt_old, nsamp_old)
+    tables = _resample_tables_cache.get(key)
+    if tables is not None:
+        return tables
+
+    t_new = np.linspace(0, nsamp * dt, nsamp, endpoint=False)
+    t_old = np.linspace(0, dt_old * nsamp_old, nsamp_old, endpoint=False)
+    idx = np.searchsorted(t_old, t_new, side="right") - 1
+    idx = np.clip(idx, 0, nsamp_old - 2)
+    w = np.clip((t_new - t_old[idx]) / (t_old[idx + 1] - t_old[idx]),
+                0.0, 1.0)
+    idx.setflags(write=False)
+    w.setflags(write=False)
+
+    if len(_resample_tables_cache) >= _RESAMPLE_TABLES_CACHE_SIZE:
+        _resample_tables_cache.clear()
+    _resample_tables_cache[key] = tables = (idx, w)
+    return tables
+
+
+def _resample_linear(dt, nsamp, dt_old, sliprates):
+    """
+    Linearly resamples the rows of sliprates, all sampled with dt_old and
+    starting at zero, to nsamp samples with a sampling of dt.
+
+    The interpolation indices and weights only depend on the sampling, so
+    they are looked up once and applied to all rows with a single gather.
+    """
+    if sliprates is None:
+        raise ValueError("source has no source time function")
+    sliprates = np.atleast_2d(sliprates)
+    nsamp_old = sliprates.shape[1]
+    if sliprates.dtype == np.object_ or nsamp_old == 0:
+        raise ValueError("source has no source time function")
+    if nsamp_old == 1:
+        return np.repeat(sliprates, nsamp, axis=1)
+
+    idx, w = _get_resample_tables(dt, nsamp, dt_old, nsamp_old)
+
+    left = sliprates[:, idx]
+    return left + (sliprates[:, idx + 1] - left) * w
+
+
 class SourceOrReceiver(object):
     def __init__(self, latitude, longitude, depth_in_m):
         self.latitude = float(latitude)
@@ -544,11 +602,8 @@ class Source(SourceOrReceiver):
         :param dt: desired sampling
         :param nsamp: desired number of samples
         """
-        t_new = np.linspace(0, nsamp * dt, nsamp, endpoint=False)
-        t_old = np.linspace(0, self.dt * len(self.sliprate),
-                            len(self.sliprate), endpoint=False)
-
-        self.sliprate = interp(t_new, t_old, self.sliprate)
+        self.sliprate = _resample_linear(dt, nsamp, self.dt,
+                                         self.sliprate)[0]
         self.dt = dt
 
     def set_sliprate_dirac(self, dt, nsamp):
@@ -1286,8 +1341,20 @@ class FiniteSource(object):
         :param dt: desired sampling
         :param nsamp: desired number of samples
         """
+        # Pointsources with the same sampling share the interpolation
+        # weights, so resample them together.
+        groups = collections.defaultdict(list)
         for ps in self.pointsources:
-            ps.resample_sliprate(dt, nsamp)
+            if ps.sliprate is None:
+                raise ValueError("source has no source time function")
+            groups[(ps.dt, len(ps.sliprate))].append(ps)
+
+        for (dt_old, _), sources in groups.items():
+            sliprates = _resample_linear(
+                dt, nsamp, dt_old, np.array([ps.sliprate for ps in sources]))
+            for ps, sliprate in zip(sources, sliprates):
+                ps.sliprate = sliprate
+                ps.dt = dt
 
     def set_sliprate_dirac(self, dt, nsamp):
         """
@@ -1326,6 +1393,43 @@ class FiniteSource(object):
         self.hypocenter_latitude = ps_hypo.latitude
         self.hypocenter_depth_in_m = ps_hypo.depth_in_m
 
+    def _sum_tensors_xyz_earth(self):
+        """
+        Rotates the moment tensors of all point sources to the global
+        cartesian system with z aligned with the north pole and returns
+        their sum in voigt notation.
+
+        Equivalent to summing
+        rotations.rotate_symm_tensor_voigt_xyz_src_to_xyz_earth() over all
+        point sources, but done for all of them at once.
+        """
+        tensors = np.array([ps.tensor_voigt for ps in self.pointsources])
+        phi = np.deg2rad([ps.longitude for ps in self.pointsources])
+        theta = np.deg2rad([ps.colatitude for ps in self.pointsources])
+
+        ct = np.cos(theta)
+        cp = np.cos(phi)
+        st = np.sin(theta)
+        sp = np.sin(phi)
+
+        # rotation matrix from TNM 2007 eq 14 for each point source
+        R = np.zeros((len(tensors), 3, 3))
+        R[:, 0, 0] = ct * cp
+        R[:, 0, 1] = -sp
+        R[:, 0, 2] = st * cp
+        R[:, 1, 0] = ct * sp
+        R[:, 1, 1] = cp
+        R[:, 1, 2] = st * sp
+        R[:, 2, 0] = -st
+        R[:, 2, 2] = ct
+
+        A = tensors[:, [[0, 5, 4], [5, 1, 3], [4, 3, 2]]]
+
+        # sum_n R_n.A_n.R_n^T
+        B = np.einsum("nik,nkl,njl->ij", R, A, R)
+        return np.array([B[0, 0], B[1, 1], B[2, 2], B[1, 2], B[0, 2],
+                         B[0, 1]])
+
     def compute_centroid(self, planet_radius=6371e3, dt=None, nsamp=None):
         """
         computes the centroid moment tensor by summing over all pointsource
@@ -1335,7 +1439,6 @@ class FiniteSource(object):
         y = 0.0
         z = 0.0
         finite_M0 = self.M0
-        finite_mij = np.zeros(6)
         finite_time_shift = 0.0  # time shift is now included in the sliprate
 
         if dt is None:
@@ -1347,7 +1450,6 @@ class FiniteSource(object):
             ps_ts_max = max(self.pointsources, key=lambda x: x.time_shift)
             nsamp = int(ps_ts_max.time_shift / dt + len(ps_ts_max.sliprate))
 
-        finite_sliprate = np.zeros(nsamp)
         nfft = next_pow_2(nsamp) * 2
         self.resample_sliprate(dt, nsamp)
 
@@ -1358,17 +1460,27 @@ class FiniteSource(object):
 
             # finite_time_shift += ps.time_shift * ps.M0 / finite_M0
 
-            mij = rotations.rotate_symm_tensor_voigt_xyz_src_to_xyz_earth(
-                ps.tensor_voigt, np.deg2rad(ps.longitude),
-                np.deg2rad(ps.colatitude))
-            finite_mij += mij
-
-            # sum sliprates with time shift applied
-            sliprate_f = np.fft.rfft(ps.sliprate, n=nfft)
-            sliprate_f *= np.exp(- 1j * rfftfreq(nfft) *
-                                 2. * np.pi * ps.time_shift / dt)
-            finite_sliprate += np.fft.irfft(sliprate_f)[:nsamp] \
-                * ps.M0 / finite_M0
+        # sum sliprates with time shift applied. The FFT is linear, so the
+        # weighted spectra are summed and only transformed back once. The
+        # forward transforms are done in blocks of pointsources to limit the
+        # memory usage for large finite sources.
+        weights = np.array([ps.M0 for ps in self.pointsources]) / finite_M0
+        time_shifts = np.array([ps.time_shift for ps in self.pointsources])
+        phase = -1j * rfftfreq(nfft) * 2. * np.pi / dt
+
+        finite_sliprate_f = np.zeros(nfft // 2 + 1, dtype=np.complex128)
+        blocksize = 256
+        for i in range(0, len(self.pointsources), blocksize):
+            block = slice(i, i + blocksize)
+            sliprate_f = np.fft.rfft(
+                np.array([ps.sliprate for ps in self.pointsources[block]]),
+                n=nfft, axis=-1)
+            sliprate_f *= np.exp(np.outer(time_shifts[block], phase))
+            finite_sliprate_f += np.dot(weights[block], sliprate_f)
+
+        finite_sliprate = np.fft.irfft(finite_sliprate_f, n=nfft)[:nsamp]
+
+        finite_mij = self._sum_tensors_xyz_earth()
 
         longitude = np.rad2deg(np.arctan2(y, x))
         colatitude = np.rad2deg(
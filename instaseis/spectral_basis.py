@@ -50,3 +50,37 @@ def lagrange_interpol_2D_td(points1, points2, coefficients, x1, x2):
         C.c_double(x2),
         interpolant.ctypes.data_as(C.POINTER(C.c_double)))
     return interpolant
+
+
+def lagrange_interpol_2D_td_multi(points1, points2, coefficients, x1, x2):
+    """
+    Same as :func:`lagrange_interpol_2D_td` but for a coefficient array of
+    shape ``(nsamp, N + 1, N + 1, ncomp)``. All components are interpolated
+    in a single call and the result has shape ``(nsamp, ncomp)``.
+    """
+    points1 = np.require(points1, dtype=np.float64,
+                         requirements=["F_CONTIGUOUS"])
+    points2 = np.require(points2, dtype=np.float64,
+                         requirements=["F_CONTIGUOUS"])
+    coefficients = np.require(coefficients, dtype=np.float64,
+                              requirements=["F_CONTIGUOUS"])
+
+    assert len(points1) == len(points2)
+
+    N = len(points1) - 1
+    nsamp = coefficients.shape[0]
+    ncomp = coefficients.shape[3]
+
+    interpolant = np.zeros((nsamp, ncomp), dtype="float64", order="F")
+
+    lib.lagrange_interpol_2D_td_multi(
+        C.c_int(N),
+        C.c_int(nsamp),
+        C.c_int(ncomp),
+        points1.ctypes.data_as(C.POINTER(C.c_double)),
+        points2.ctypes.data_as(C.POINTER(C.c_double)),
+        coefficients.ctypes.data_as(C.POINTER(C.c_double)),
+        C.c_double(x1),
+        C.c_double(x2),
+        interpolant.ctypes.data_as(C.POINTER(C.c_double)))
+    return interpolant
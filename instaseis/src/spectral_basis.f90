@@ -14,6 +14,7 @@ module spectral_basis
     private
 
     public :: lagrange_interpol_2D_td
+    public :: lagrange_interpol_2D_td_multi
 
 contains
 
@@ -34,6 +35,21 @@ subroutine lagrange_interpol_2D_td_wrapped(N, nsamp, points1, points2, coefficie
 end subroutine
 !-----------------------------------------------------------------------------------------
 
+!-----------------------------------------------------------------------------------------
+subroutine lagrange_interpol_2D_td_multi_wrapped(N, nsamp, ncomp, points1, points2, &
+                                                 coefficients, x1, x2, interpolant) &
+  bind(c, name="lagrange_interpol_2D_td_multi")
+
+  integer(c_int), intent(in), value  :: N, nsamp, ncomp
+  real(c_double), intent(in)         :: points1(0:N), points2(0:N)
+  real(c_double), intent(in)         :: coefficients(1:nsamp, 0:N, 0:N, 1:ncomp)
+  real(c_double), intent(in), value  :: x1, x2
+  real(c_double), intent(out)        :: interpolant(nsamp, ncomp)
+
+  interpolant = lagrange_interpol_2D_td_multi(points1, points2, coefficients, x1, x2)
+end subroutine
+!-----------------------------------------------------------------------------------------
+
 !== END  C Wrappers ======================================================================
 
 !-----------------------------------------------------------------------------------------
@@ -81,5 +97,52 @@ function lagrange_interpol_2D_td(points1, points2, coefficients, x1, x2)
 end function lagrange_interpol_2D_td
 !-----------------------------------------------------------------------------------------
 
+!-----------------------------------------------------------------------------------------
+!> same as lagrange_interpol_2D_td, but for several components at once, so the 1D
+!  interpolation weights are only computed a single time
+function lagrange_interpol_2D_td_multi(points1, points2, coefficients, x1, x2)
+
+  real(dp), intent(in)  :: points1(0:), points2(0:)
+  real(dp), intent(in)  :: coefficients(:,0:,0:,:)
+  real(dp), intent(in)  :: x1, x2
+  real(dp)              :: lagrange_interpol_2D_td_multi(size(coefficients,1), &
+                                                         size(coefficients,4))
+  real(dp)              :: l_i(0:size(points1)-1), l_j(0:size(points2)-1)
+
+  integer               :: i, j, k, m1, m2, n1, n2
+
+  n1 = size(points1) - 1
+  n2 = size(points2) - 1
+
+  do i=0, n1
+     l_i(i) = 1
+     do m1=0, n1
+        if (m1 == i) cycle
+        l_i(i) = l_i(i) * (x1 - points1(m1)) / (points1(i) - points1(m1))
+     enddo
+  enddo
+
+  do j=0, n2
+     l_j(j) = 1
+     do m2=0, n2
+        if (m2 == j) cycle
+        l_j(j) = l_j(j) * (x2 - points2(m2)) / (points2(j) - points2(m2))
+     enddo
+  enddo
+
+  lagrange_interpol_2D_td_multi(:,:) = 0
+
+  do k=1, size(coefficients,4)
+     do i=0, n1
+        do j=0, n2
+           lagrange_interpol_2D_td_multi(:,k) = lagrange_interpol_2D_td_multi(:,k) &
+                                                + coefficients(:,i,j,k) * l_i(i) * l_j(j)
+        enddo
+     enddo
+  enddo
+
+end function lagrange_interpol_2D_td_multi
+!-----------------------------------------------------------------------------------------
+
 end module
 !=========================================================================================
@@ -42,3 +42,21 @@ def test_buffer():
     # Once more not in.
     assert "d" not in buf
     assert buf.efficiency == 2.0 / 4.0
+
+
+def test_buffer_get():
+    buf = Buffer(max_size_in_mb=1.0)
+    value = np.empty(2, dtype=np.int8)
+    buf.add("a", value)
+
+    # Hits and fails of get() count towards the efficiency.
+    assert buf.get("a") is value
+    assert buf.get("b") is None
+    assert buf.efficiency == 1.0 / 2.0
+
+    # Retrieving an item makes it the last one to be removed.
+    buf.add("b", np.empty(2, dtype=np.int8))
+    buf.get("a")
+    buf.add("c", np.empty(1024 ** 2 - 3, dtype=np.int8))
+    assert "a" in buf
+    assert "b" not in buf
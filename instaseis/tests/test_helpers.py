@@ -11,7 +11,9 @@ Tests for some helper routines.
 """
 from __future__ import absolute_import, division
 
-from instaseis.helpers import io_chunker
+import numpy as np
+
+from instaseis.helpers import io_chunker, rfftfreq
 
 
 def test_io_chunker():
@@ -29,3 +31,23 @@ def test_io_chunker():
     # A couple more complex cases.
     assert io_chunker([0, 1, 2, 4, 6, 7, 8]) == [[0, 3], 4, [6, 9]]
     assert io_chunker([0, 2, 4, 6, 7, 8, 10]) == [0, 2, 4, [6, 9], 10]
+
+    # Numpy arrays and edge cases.
+    assert io_chunker(np.array([5, 6, 9])) == [[5, 7], 9]
+    assert io_chunker([4]) == [4]
+    assert io_chunker([]) == []
+
+
+def test_rfftfreq():
+    """
+    Tests the cached rfftfreq() against numpy's version.
+    """
+    for n in (1, 2, 7, 8, 1024, 1025):
+        for d in (1.0, 0.1, 3):
+            np.testing.assert_array_equal(rfftfreq(n, d),
+                                          np.fft.rfftfreq(n, d))
+
+    # Repeated calls return the same read-only array.
+    freqs = rfftfreq(16, 0.5)
+    assert freqs is rfftfreq(16, 0.5)
+    assert not freqs.flags.writeable
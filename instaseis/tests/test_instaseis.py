@@ -25,7 +25,7 @@ import instaseis
 from instaseis import InstaseisError, InstaseisNotFoundError
 from instaseis.database_interfaces import find_and_open_files
 from instaseis.database_interfaces.base_instaseis_db import \
-    _get_seismogram_times
+    _get_seismogram_times, INV_KIND_MAP, STF_MAP
 from instaseis import Source, Receiver, ForceSource
 from instaseis.helpers import (get_band_code, elliptic_to_geocentric_latitude,
                                geocentric_to_elliptic_latitude, sizeof_fmt)
@@ -505,6 +505,14 @@ def test_incremental_bwd_force_source(db):
     np.testing.assert_allclose(st_bwd.select(component='T')[0].data,
                                BWD_FORCE_TEST_DATA["T"], rtol=1E-7, atol=1E-12)
 
+    # The second extraction is served from the displacement buffer and must
+    # yield the same result.
+    st_bwd_2 = instaseis_bwd.get_seismograms(
+        source=source, receiver=receiver, components=('Z', 'N', 'E', 'R', 'T'),
+        kind='velocity')
+    for tr, tr_2 in zip(st_bwd, st_bwd_2):
+        np.testing.assert_allclose(tr_2.data, tr.data, rtol=1E-7, atol=1E-12)
+
     # Force source does not work with strain databases.
     db_strain = find_and_open_files(
         os.path.join(DATA, "100s_db_bwd_strain_only"))
@@ -762,6 +770,10 @@ def test_get_band_code_method():
     for dt, letter in codes.items():
         assert get_band_code(dt) == letter
 
+    # Also works with arrays.
+    dts = sorted(codes.keys())
+    assert get_band_code(np.array(dts)).tolist() == [codes[_i] for _i in dts]
+
 
 @pytest.mark.parametrize("bwd_db", BW_DISPL_DBS)
 def test_origin_time_of_resulting_seismograms(bwd_db):
@@ -1475,6 +1487,31 @@ def test_coordinate_conversions_round_trips():
         assert abs(back - value) < 1E-12
 
 
+def test_coordinate_conversions_arrays():
+    """
+    The latitude conversions also work on arrays and give the same results
+    as for the individual values.
+    """
+    values = np.concatenate([np.linspace(-90, 90, 101), [1E-7, 90 - 1E-7]])
+    for func in (elliptic_to_geocentric_latitude,
+                 geocentric_to_elliptic_latitude):
+        result = func(values)
+        assert result.shape == values.shape
+        expected = [func(float(_i)) for _i in values]
+        np.testing.assert_allclose(result, expected, rtol=1E-14, atol=0)
+        # Singularities are passed through.
+        assert result[0] == -90.0
+        assert result[50] == 0.0
+        assert result[100] == 90.0
+        assert result[-1] == values[-1]
+
+        # Also works with non-default axes.
+        np.testing.assert_allclose(
+            func(values, axis_a=3396190.0, axis_b=3376200.0),
+            [func(float(_i), axis_a=3396190.0, axis_b=3376200.0)
+             for _i in values], rtol=1E-14, atol=0)
+
+
 def test_receiver_settings():
     db = find_and_open_files(os.path.join(DATA, "100s_db_fwd"))
 
@@ -1558,6 +1595,9 @@ def test_sizeof_fmt_function():
     assert sizeof_fmt(1024 ** 2) == "1.0 MB"
     assert sizeof_fmt(1024 ** 3) == "1.0 GB"
     assert sizeof_fmt(1024 ** 4) == "1.0 TB"
+    assert sizeof_fmt(float("inf")) == "inf TB"
+    assert sizeof_fmt(-float("inf")) == "-inf TB"
+    assert sizeof_fmt(float("nan")) == "nan TB"
 
 
 def test_failures_when_opening_databases(tmpdir):
@@ -1930,3 +1970,114 @@ def test_no_downsampling(bwd_db):
         "The database is sampled with a sample spacing of 24.725 seconds. You "
         "must not pass a 'dt' larger than that as that would be a "
         "downsampling operation which Instaseis does not do.")
+
+
+@pytest.mark.skipif(
+    "merged_100s_db_bwd_displ_only" not in pytest.config.dbs["databases"],
+    reason="requires generated tests databases.")
+def test_merged_database_strain_buffer_halves():
+    """
+    The strain of the horizontal and the vertical part of merged databases
+    is only computed if needed and buffered separately.
+    """
+    db = instaseis.open_db(
+        pytest.config.dbs["databases"]["merged_100s_db_bwd_displ_only"])
+    buf = db.meshes.merged.strain_buffer
+
+    receiver = Receiver(latitude=42.6390, longitude=74.4940)
+    source = Source(
+        latitude=89.91, longitude=0.0, depth_in_m=12000,
+        m_rr=4.710000e+24 / 1E7,
+        m_tt=3.810000e+22 / 1E7,
+        m_pp=-4.740000e+24 / 1E7,
+        m_rt=3.990000e+23 / 1E7,
+        m_rp=-8.050000e+23 / 1E7,
+        m_tp=-1.230000e+24 / 1E7)
+
+    st_z = db.get_seismograms(source=source, receiver=receiver,
+                              components=["Z"])
+    assert buf.efficiency == 0.0
+    assert len(buf._buffer) == 1
+
+    # The horizontal part is not yet buffered.
+    st_n = db.get_seismograms(source=source, receiver=receiver,
+                              components=["N"])
+    assert buf.efficiency == 0.0
+    assert len(buf._buffer) == 2
+
+    # Now both are.
+    st = db.get_seismograms(source=source, receiver=receiver,
+                            components=["Z", "N"])
+    assert buf.efficiency == 2.0 / 4.0
+    assert st.select(component="Z") == st_z
+    assert st.select(component="N") == st_n
+
+
+@pytest.mark.parametrize("db", DBS)
+def test_seismograms_are_contiguous(db):
+    """
+    All components are returned as contiguous arrays, otherwise e.g.
+    writing MiniSEED has to copy them again.
+    """
+    db = find_and_open_files(db)
+    receiver = Receiver(latitude=42.6390, longitude=74.4940)
+    source = Source(
+        latitude=89.91, longitude=0.0, depth_in_m=12000,
+        m_rr=4.710000e+24 / 1E7,
+        m_tt=3.810000e+22 / 1E7,
+        m_pp=-4.740000e+24 / 1E7,
+        m_rt=3.990000e+23 / 1E7,
+        m_rp=-8.050000e+23 / 1E7,
+        m_tp=-1.230000e+24 / 1E7)
+    force_source = ForceSource(latitude=89.91, longitude=0.0,
+                               depth_in_m=12000, f_r=1E10, f_t=1E10,
+                               f_p=1E10)
+
+    components = ["Z", "N", "E", "R", "T"]
+    if db.info.is_reciprocal:
+        if "vertical" not in db.info.components:
+            components.remove("Z")
+        if "horizontal" not in db.info.components:
+            components = ["Z"]
+
+    # The units of the database, otherwise the final differentiation would
+    # copy the data anyway.
+    kind = INV_KIND_MAP[STF_MAP[db.info.stf]]
+
+    # Force sources only work with reciprocal databases.
+    sources = [source, force_source] if db.info.is_reciprocal else [source]
+    for src in sources:
+        st = db.get_seismograms(source=src, receiver=receiver,
+                                components=components, kind=kind)
+        assert len(st) == len(components) > 0
+        for tr in st:
+            assert tr.data.flags.c_contiguous
+
+
+def test_receiver_rotation_is_reused_for_finite_sources(monkeypatch):
+    """
+    The receiver part of the source tensor rotation is only computed once
+    for all point sources of a finite source.
+    """
+    from instaseis import rotations
+
+    db = instaseis.open_db(os.path.join(DATA, "100s_db_bwd_displ_only"))
+    receiver = Receiver(latitude=42.6390, longitude=74.4940)
+    finite_source = instaseis.FiniteSource.from_srf_file(
+        os.path.join(DATA, "strike_slip_eq_10pts.srf"), True)
+    assert len(finite_source.pointsources) == 10
+    finite_source.resample_sliprate(dt=db.info.dt, nsamp=db.info.npts)
+
+    calls = []
+    original = rotations.get_rotmat_xyz_earth_to_xyz_src
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(rotations, "get_rotmat_xyz_earth_to_xyz_src",
+                        counting)
+
+    db.get_seismograms_finite_source(sources=finite_source,
+                                     receiver=receiver, components=["Z"])
+    assert len(calls) == 1
@@ -51,6 +51,57 @@ def test_rotate_tensor_xyz_to_src():
     np.testing.assert_allclose(mt_ref, mt_rot, atol=1e-10)
 
 
+def test_rotate_tensor_xyz_src_to_src():
+    """
+    The composed rotation has to match the three individual rotations.
+    """
+    mt = np.array([1., 2., 3., 4., 5., 6.])
+    srclon, srccolat = np.radians(13.), np.radians(29.)
+    reclon, reccolat = np.radians(-37.), np.radians(101.)
+    phi = np.radians(71.)
+
+    mt_ref = rotations.rotate_symm_tensor_voigt_xyz_src_to_xyz_earth(
+        mt, srclon, srccolat)
+    mt_ref = rotations.rotate_symm_tensor_voigt_xyz_earth_to_xyz_src(
+        mt_ref, reclon, reccolat)
+    mt_ref = rotations.rotate_symm_tensor_voigt_xyz_to_src(mt_ref, phi)
+
+    mt_rot = rotations.rotate_symm_tensor_voigt_xyz_src_to_src(
+        mt, srclon, srccolat, reclon, reccolat, phi)
+    np.testing.assert_allclose(mt_ref, mt_rot, atol=1e-10)
+
+    # Same with a precomputed receiver rotation.
+    rotmat_receiver = rotations.get_rotmat_xyz_earth_to_xyz_src(reclon,
+                                                                reccolat)
+    np.testing.assert_array_equal(
+        rotations.rotate_symm_tensor_voigt_xyz_src_to_src(
+            mt, srclon, srccolat, reclon, reccolat, phi,
+            rotmat_receiver=rotmat_receiver), mt_rot)
+
+    # The bond matrix of the identity is the identity.
+    np.testing.assert_allclose(rotations.voigt_bond_matrix(np.eye(3)),
+                               np.eye(6))
+
+
+def test_rotation_matrices():
+    """
+    The rotation matrices are the same as rotating the unit vectors.
+    """
+    phi, theta = np.radians(-37.), np.radians(101.)
+    np.testing.assert_allclose(
+        rotations.get_rotmat_xyz_earth_to_xyz_src(phi, theta),
+        rotations.rotate_vector_xyz_earth_to_xyz_src(np.eye(3), phi, theta),
+        rtol=1E-15, atol=1E-15)
+    np.testing.assert_allclose(
+        rotations.get_rotmat_xyz_src_to_xyz_earth(phi, theta),
+        rotations.rotate_vector_xyz_src_to_xyz_earth(np.eye(3), phi, theta),
+        rtol=1E-15, atol=1E-15)
+    np.testing.assert_allclose(
+        rotations.get_rotmat_xyz_to_src(phi),
+        rotations.rotate_vector_xyz_to_src(np.eye(3), phi),
+        rtol=1E-15, atol=1E-15)
+
+
 def test_rotate_vector_src_to_xyz():
     # identity
     v = np.array([1., 2., 3.])
@@ -241,6 +241,78 @@ def test_resample_stf():
         np.testing.assert_allclose(stf_ref, src.sliprate)
 
 
+def test_resample_stf_mixed_sampling():
+    """
+    Pointsources with different sampling are resampled the same way as if
+    they would be resampled one by one with numpy.interp().
+    """
+    finitesource = FiniteSource.from_srf_file(SRF_FILE, True)
+    finitesource.pointsources[0].sliprate = np.linspace(0, 1, 7)
+    finitesource.pointsources[0].dt = 0.37
+
+    t_new = np.linspace(0, 20 * 0.4, 20, endpoint=False)
+    expected = []
+    for src in finitesource:
+        t_old = np.linspace(0, src.dt * len(src.sliprate), len(src.sliprate),
+                            endpoint=False)
+        expected.append(np.interp(t_new, t_old, src.sliprate))
+
+    finitesource.resample_sliprate(dt=0.4, nsamp=20)
+
+    for src, exp in zip(finitesource, expected):
+        assert src.dt == 0.4
+        np.testing.assert_allclose(src.sliprate, exp, rtol=1E-12, atol=1E-20)
+
+
+def test_resample_stf_invalid_sliprates():
+    """
+    Missing or empty sliprates cannot be resampled.
+    """
+    src = Source(0.0, 0.0, 0.0, m_rr=1.0)
+    with pytest.raises(ValueError):
+        src.resample_sliprate(dt=0.1, nsamp=5)
+    assert src.sliprate is None
+
+    src = Source(0.0, 0.0, 0.0, m_rr=1.0, sliprate=np.array([]), dt=0.1)
+    with pytest.raises(ValueError):
+        src.resample_sliprate(dt=0.1, nsamp=5)
+
+    finitesource = FiniteSource(pointsources=[
+        Source(0.0, 0.0, 0.0, m_rr=1.0, sliprate=np.ones(3), dt=0.1),
+        Source(0.0, 0.0, 0.0, m_rr=1.0)])
+    with pytest.raises(ValueError):
+        finitesource.resample_sliprate(dt=0.1, nsamp=5)
+
+    finitesource = FiniteSource(pointsources=[
+        Source(0.0, 0.0, 0.0, m_rr=1.0, sliprate=np.array([]), dt=0.1)])
+    with pytest.raises(ValueError):
+        finitesource.resample_sliprate(dt=0.1, nsamp=5)
+
+    # A single sample is simply repeated.
+    src = Source(0.0, 0.0, 0.0, m_rr=1.0, sliprate=np.array([2.0]), dt=0.1)
+    src.resample_sliprate(dt=0.1, nsamp=5)
+    np.testing.assert_array_equal(src.sliprate, 2.0 * np.ones(5))
+
+
+def test_resample_tables_are_cached():
+    """
+    The interpolation tables only depend on the sampling and are reused.
+    """
+    from instaseis.source import _get_resample_tables
+
+    idx, w = _get_resample_tables(0.4, 20, 0.37, 7)
+    assert _get_resample_tables(0.4, 20, 0.37, 7)[0] is idx
+    assert not idx.flags.writeable
+    assert not w.flags.writeable
+
+    # Resampling two sources the same way gives the same result.
+    src_1 = Source(0.0, 0.0, 0.0, sliprate=np.linspace(0, 1, 7), dt=0.37)
+    src_2 = Source(0.0, 0.0, 0.0, sliprate=np.linspace(0, 1, 7), dt=0.37)
+    src_1.resample_sliprate(dt=0.4, nsamp=20)
+    src_2.resample_sliprate(dt=0.4, nsamp=20)
+    np.testing.assert_array_equal(src_1.sliprate, src_2.sliprate)
+
+
 def test_hypocenter():
     """
     Tests finding the hypocenter
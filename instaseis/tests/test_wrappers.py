@@ -14,7 +14,7 @@ from __future__ import absolute_import
 import numpy as np
 
 
-from instaseis import finite_elem_mapping, rotations
+from instaseis import finite_elem_mapping, rotations, spectral_basis
 
 
 def test_rotate_frame_rd():
@@ -41,3 +41,22 @@ def test_inside_element():
     assert is_in
     assert abs(xi - -0.68507753579755248 < 1E-5)
     assert abs(eta - -0.60000654152462352 < 1E-5)
+
+
+def test_lagrange_interpol_2D_td_multi():
+    """
+    The multi-component interpolation must match interpolating each
+    component separately.
+    """
+    np.random.seed(12345)
+    points = np.array([-1.0, -0.65465367, 0.0, 0.65465367, 1.0])
+    coefficients = np.random.random((20, 5, 5, 6))
+
+    result = spectral_basis.lagrange_interpol_2D_td_multi(
+        points, points, coefficients, 0.3, -0.7)
+    assert result.shape == (20, 6)
+
+    for i in range(6):
+        expected = spectral_basis.lagrange_interpol_2D_td(
+            points, points, coefficients[:, :, :, i], 0.3, -0.7)
+        np.testing.assert_allclose(result[:, i], expected, rtol=1E-12)